@@ -2,37 +2,39 @@
 SILVER LAYER - User CDC Processing (SCD Type 1 and Type 2)
 
 PURPOSE:
-This module implements Change Data Capture (CDC) by simply returning the latest snapshot.
+This module implements Change Data Capture (CDC) on top of full snapshots.
 Since our source systems don't have native CDC enabled, we work with full snapshots.
 
-SIMPLIFIED APPROACH FOR BATCH CDC:
-Instead of complex MERGE operations in DLT, we use a simpler pattern:
-- SCD Type 1: Return latest snapshot (DLT overwrites with mode="complete")
+SNAPSHOT CDC APPROACH FOR BATCH CDC:
+Instead of hand-written MERGE statements, DLT computes the changes for us:
+- SCD Type 1: apply_changes_from_snapshot() diffs consecutive snapshots by cpf
+  and MERGEs only inserted/updated/deleted keys into the target
 - SCD Type 2: For complex history tracking, use views or separate processing
 
-WHY THIS SIMPLER APPROACH?
-- DLT's declarative model works best with "return what you want"
-- Manual MERGE operations cause first-run issues (table doesn't exist)
-- For true CDC, use apply_changes() with streaming sources (see stream-cdc folder)
-- For batch snapshots, keep it simple: just return the current state
+WHY SNAPSHOT CDC?
+- Source systems only export full snapshots, not change events
+- DLT manages the MERGE and target creation (no first-run "table doesn't exist" issues)
+- Unchanged users are not rewritten on each run
+- For true CDC events, use apply_changes() with streaming sources (see stream-cdc folder)
 
 WHAT IT DOES:
 - Reads unified snapshot from silver_users_staging
-- Returns SCD Type 1 table (current state only)
+- Applies snapshot changes to SCD Type 1 table (current state only)
 - Returns SCD Type 2 table (full history via append)
 - Tracks all changes for LGPD/GDPR compliance requirements
 
 DATA FLOW:
   silver_users_staging (materialized view - complete snapshot)
-    → Return current snapshot
-    → silver_users_unified (SCD Type 1 - current state via COMPLETE mode)
+    → silver_users_snapshot (view - drops per-run processed_timestamp)
+    → apply_changes_from_snapshot() (only changed keys are written)
+    → silver_users_unified (SCD Type 1 - current state)
     → silver_users_history (SCD Type 2 - append new versions)
 
 WHY TWO CDC TABLES?
 
 SCD Type 1 (Current State):
 - Stores ONLY the latest version of each user
-- Each run replaces entire table (COMPLETE mode)
+- Each run writes only the keys that changed since the previous snapshot
 - Use Cases: Operational dashboards, current user lookups, marketing campaigns
 - Example: Marketing needs current email addresses for campaigns
 
@@ -45,7 +47,7 @@ SCD Type 2 (Full History):
 
 LEARNING OBJECTIVES:
 - Understand DLT's declarative model
-- Implement simple SCD Type 1 (complete refresh)
+- Implement SCD Type 1 from snapshots with apply_changes_from_snapshot()
 - Implement SCD Type 2 (append-only history)
 - Handle batch CDC for compliance requirements (LGPD/GDPR)
 
@@ -58,7 +60,6 @@ silver_users_unified (SCD Type 1):
 - first_name, last_name, birthday, job, company_name: MSSQL fields
 - phone_number, country: Common fields
 - dt_current_timestamp: Source system timestamp
-- updated_at: When this record was processed
 
 silver_users_history (SCD Type 2):
 - All columns from SCD Type 1 PLUS:
@@ -77,15 +78,31 @@ import dlt
 from pyspark.sql import functions as F
 
 # ============================================================================
-# SCD TYPE 1 - Current State (Complete Refresh)
+# SCD TYPE 1 - Current State (Snapshot Diff)
 # ============================================================================
 # Creates/updates: silver_users_unified
-# Behavior: Each run replaces entire table with latest snapshot
+# Behavior: Each run diffs the latest snapshot against the previous one and
+#           applies only the inserted/updated/deleted keys
 # Use Case: Operational queries, marketing campaigns, customer support
 
-@dlt.table(
+@dlt.view(
+    name="silver_users_snapshot",
+    comment="Staging snapshot without per-run columns - source for snapshot CDC"
+)
+def silver_users_snapshot():
+    """
+    Staging snapshot minus processed_timestamp.
+
+    processed_timestamp is current_timestamp() in the staging view, so it
+    changes on every refresh and would make every cpf look modified.
+    """
+    return dlt.read("silver_users_staging").drop("processed_timestamp")
+
+
+dlt.create_streaming_table(
     name="silver_users_unified",
-    comment="Current state of unified user profiles - SCD Type 1 (complete refresh)",
+    comment="Current state of unified user profiles - SCD Type 1 (snapshot CDC)",
+    cluster_by=["cpf"],
     table_properties={
         "quality": "silver",
         "layer": "curation",
@@ -95,19 +112,13 @@ from pyspark.sql import functions as F
         "pipelines.autoOptimize.managed": "true"
     }
 )
-def silver_users_unified():
-    """
-    SCD Type 1 implementation - returns latest snapshot.
 
-    DLT will replace the entire table with this snapshot on each run.
-    """
-    # Read staging data (complete snapshot)
-    staging_df = dlt.read("silver_users_staging")
-
-    # Add processing timestamp
-    result_df = staging_df.withColumn("updated_at", F.current_timestamp())
-
-    return result_df
+dlt.apply_changes_from_snapshot(
+    target="silver_users_unified",
+    source="silver_users_snapshot",
+    keys=["cpf"],
+    stored_as_scd_type=1
+)
 
 
 # ============================================================================
@@ -126,6 +137,7 @@ def silver_users_unified():
 @dlt.table(
     name="silver_users_history",
     comment="Change history of user profiles - SCD Type 2 (append-only)",
+    cluster_by=["cpf"],
     table_properties={
         "quality": "silver",
         "layer": "curation",
@@ -179,11 +191,11 @@ def silver_users_history():
 # ============================================================================
 
 """
-SIMPLIFIED BATCH CDC PATTERN:
-✅ Works on first run (no table existence issues)
+BATCH CDC PATTERN:
+✅ Works on first run (DLT creates the Type 1 target)
 ✅ Works on subsequent runs (reliable)
-✅ Simple, declarative DLT pattern
-✅ No complex MERGE operations
+✅ Type 1: DLT diffs snapshots and MERGEs only changed keys
+✅ No hand-written MERGE statements
 ✅ Easy to understand and maintain
 
 TRADE-OFFS:
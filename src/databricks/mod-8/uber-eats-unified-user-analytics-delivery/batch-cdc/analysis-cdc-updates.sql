@@ -24,7 +24,8 @@
 --
 -- IMPORTANT NOTE ON SIMPLIFIED PATTERN:
 -- This implementation uses a simplified declarative pattern:
--- - Type 1 (silver_users_unified): Overwrites with latest snapshot
+-- - Type 1 (silver_users_unified): apply_changes_from_snapshot() MERGEs only keys
+--   that changed since the previous snapshot
 -- - Type 2 (silver_users_history): Appends every snapshot with start_date timestamp
 -- - is_current column is always TRUE (simplified approach)
 -- - To find actual changes, compare snapshots by start_date
@@ -185,8 +186,8 @@ SELECT
   CASE WHEN t1.city = t2.city THEN '✓ Match' ELSE '✗ MISMATCH' END AS city_match,
   CASE WHEN t1.job = t2.job THEN '✓ Match' ELSE '✗ MISMATCH' END AS job_match,
 
-  t1.updated_at AS type1_timestamp,
-  t2.start_date AS type2_timestamp
+  t1.dt_current_timestamp AS type1_latest_source_event,
+  t2.start_date AS type2_snapshot_captured
 
 FROM onewaysolution.batch.silver_users_unified AS t1
 INNER JOIN latest_type2 AS t2
@@ -203,11 +204,15 @@ LIMIT 100;
 -- ============================================================================
 -- Count validation: Type 1 should match Type 2 latest snapshot count
 -- Use Case: Data quality monitoring
+-- NOTE: Type 1 has no per-run timestamp (it would defeat the snapshot diff);
+--       use DESCRIBE HISTORY onewaysolution.batch.silver_users_unified for
+--       its last commit time
 
 SELECT
   'SCD Type 1 (Current State)' AS table_name,
   COUNT(DISTINCT cpf) AS user_count,
-  MAX(updated_at) AS last_refresh
+  'latest source event (dt_current_timestamp)' AS timestamp_kind,
+  MAX(dt_current_timestamp) AS latest_timestamp
 FROM onewaysolution.batch.silver_users_unified
 
 UNION ALL
@@ -215,7 +220,8 @@ UNION ALL
 SELECT
   'SCD Type 2 (Latest Snapshot)' AS table_name,
   COUNT(DISTINCT cpf) AS user_count,
-  MAX(start_date) AS last_refresh
+  'snapshot captured (start_date)' AS timestamp_kind,
+  MAX(start_date) AS latest_timestamp
 FROM onewaysolution.batch.silver_users_history
 WHERE start_date = (SELECT MAX(start_date) FROM onewaysolution.batch.silver_users_history)
 
@@ -224,7 +230,8 @@ UNION ALL
 SELECT
   'SCD Type 2 (All Snapshots)' AS table_name,
   COUNT(*) AS user_count,
-  MAX(start_date) AS last_refresh
+  'snapshot captured (start_date)' AS timestamp_kind,
+  MAX(start_date) AS latest_timestamp
 FROM onewaysolution.batch.silver_users_history;
 
 -- ============================================================================
@@ -400,7 +407,8 @@ LIMIT 50;
 --
 -- 1. Type 1 (silver_users_unified):
 --    - Stores ONLY latest state
---    - Overwrites on each run
+--    - Each run diffs the new snapshot against the previous one and
+--      updates only inserted/changed/deleted keys
 --    - Query for current operational data
 --
 -- 2. Type 2 (silver_users_history):
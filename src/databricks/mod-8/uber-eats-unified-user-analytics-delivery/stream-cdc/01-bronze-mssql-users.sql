@@ -10,7 +10,11 @@
 -- - Ingests CDC events from MSSQL using Auto Loader
 -- - Creates a STREAMING TABLE for continuous processing
 -- - Preserves CDC metadata (operation, sequenceNum)
--- - No transformations - raw data as-is
+-- - Casts CDC keys/metadata once at ingest so Silver only projects them
+-- - Drops events without cpf (the CDC business key)
+-- - Drops events without dt_current_timestamp/sequenceNum (Silver sequences by both)
+-- - zstd Parquet; low-cardinality columns (operation, country) stay
+--   dictionary-encoded for vectorized Photon scans
 --
 -- CDC EVENT STRUCTURE:
 -- - operation: INSERT, UPDATE, DELETE
@@ -22,15 +26,24 @@
 -- This Bronze table feeds into Silver layer where apply_changes()
 -- automatically handles INSERT/UPDATE/DELETE operations.
 
-CREATE OR REFRESH STREAMING TABLE bronze_mssql_users
+CREATE OR REFRESH STREAMING TABLE bronze_mssql_users (
+  CONSTRAINT valid_cpf EXPECT (cpf IS NOT NULL) ON VIOLATION DROP ROW,
+  CONSTRAINT valid_sequence EXPECT (dt_current_timestamp IS NOT NULL AND sequenceNum IS NOT NULL) ON VIOLATION DROP ROW
+)
 COMMENT 'MSSQL CDC events - Auto Loader ingestion'
 TBLPROPERTIES (
   'quality' = 'bronze',
-  'delta.enableChangeDataFeed' = 'true'
+  'delta.enableChangeDataFeed' = 'true',
+  'delta.parquet.compression.codec' = 'zstd',
+  'delta.tuneFileSizesForRewrites' = 'true'
 )
 AS
 SELECT
-  *,
+  * EXCEPT (user_id, sequenceNum, dt_current_timestamp, birthday),
+  CAST(user_id AS BIGINT) AS user_id,
+  CAST(sequenceNum AS BIGINT) AS sequenceNum,
+  CAST(dt_current_timestamp AS TIMESTAMP) AS dt_current_timestamp,
+  CAST(birthday AS DATE) AS birthday,
   current_timestamp() AS ingestion_timestamp,
   _metadata.file_path AS source_file
 FROM cloud_files(
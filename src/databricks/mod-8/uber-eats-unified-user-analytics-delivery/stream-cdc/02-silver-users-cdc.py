@@ -8,7 +8,7 @@ Demonstrates Databricks Auto CDC API with minimal code.
 Shows how apply_changes() automatically handles INSERT/UPDATE/DELETE operations.
 
 WHAT IT DOES:
-- Unions CDC events from MongoDB and MSSQL
+- Unions CDC events from MongoDB and MSSQL in one view (bronze_users_union)
 - Uses apply_changes() to automatically process CDC operations
 - Creates SCD Type 1 (current state) table
 - Creates SCD Type 2 (full history) table
@@ -24,55 +24,88 @@ https://docs.databricks.com/aws/en/ldp/cdc?language=Python
 """
 
 import dlt
-from pyspark.sql.functions import col, lit
+from pyspark.sql.functions import col, expr, isnull, xxhash64
+
+CDC_SPARK_CONF = {
+    "pipelines.trigger.interval": "10 minutes",
+    "spark.sql.shuffle.partitions": "32"
+}
 
 # ============================================================================
 # STEP 1: Union CDC Streams
 # ============================================================================
 
+@dlt.view(
+    name="bronze_users_union",
+    comment="MongoDB and MSSQL CDC events aligned by column name"
+)
+def bronze_users_union():
+    """
+    Combines CDC events from both sources.
+    Bronze already casts the CDC columns and drops rows without cpf.
+    UNION BY NAME fills the columns a source lacks with NULL at plan time.
+    """
+
+    # Read MongoDB CDC stream
+    mongodb = dlt.read_stream("bronze_mongodb_users").selectExpr(
+        "cpf",
+        "user_id",
+        "email",
+        "delivery_address",
+        "city",
+        "operation",
+        "sequenceNum",
+        "dt_current_timestamp"
+    )
+
+    # Read MSSQL CDC stream
+    mssql = dlt.read_stream("bronze_mssql_users").selectExpr(
+        "cpf",
+        "user_id",
+        "first_name",
+        "last_name",
+        "job",
+        "operation",
+        "sequenceNum",
+        "dt_current_timestamp"
+    )
+
+    # Union both streams (missing columns become NULL)
+    return mongodb.unionByName(mssql, allowMissingColumns=True)
+
+
 @dlt.table(
     name="silver_users_staging",
     comment="Unified CDC events from MongoDB and MSSQL",
+    spark_conf=CDC_SPARK_CONF,
     table_properties={"quality": "silver"}
 )
 def silver_users_staging():
     """
-    Combines CDC events from both sources.
-    Simple UNION - apply_changes() handles the merging.
+    Reads the unified CDC stream - apply_changes() handles the merging.
     """
 
-    # Read MongoDB CDC stream
-    mongodb = dlt.read_stream("bronze_mongodb_users").select(
-        col("cpf"),
-        col("user_id").cast("bigint").alias("user_id"),
-        col("email"),
-        col("delivery_address"),
-        col("city"),
-        lit(None).cast("string").alias("first_name"),
-        lit(None).cast("string").alias("last_name"),
-        lit(None).cast("string").alias("job"),
-        col("operation"),
-        col("sequenceNum").cast("bigint").alias("sequenceNum"),
-        col("dt_current_timestamp").cast("timestamp").alias("dt_current_timestamp")
-    ).filter(col("cpf").isNotNull())
-
-    # Read MSSQL CDC stream
-    mssql = dlt.read_stream("bronze_mssql_users").select(
-        col("cpf"),
-        col("user_id").cast("bigint").alias("user_id"),
-        lit(None).cast("string").alias("email"),
-        lit(None).cast("string").alias("delivery_address"),
-        lit(None).cast("string").alias("city"),
-        col("first_name"),
-        col("last_name"),
-        col("job"),
-        col("operation"),
-        col("sequenceNum").cast("bigint").alias("sequenceNum"),
-        col("dt_current_timestamp").cast("timestamp").alias("dt_current_timestamp")
-    ).filter(col("cpf").isNotNull())
-
-    # Union both streams
-    return mongodb.union(mssql)
+    return (
+        dlt.read_stream("bronze_users_union")
+        # Single hash of the SCD Type 2 tracked fields; the isnull() flags
+        # record which fields are set (xxhash64 skips NULLs, which would let
+        # a value moving between fields hash the same)
+        .withColumn(
+            "content_hash",
+            xxhash64(
+                "email", "delivery_address", "city", "first_name", "last_name", "job",
+                isnull("email"), isnull("delivery_address"), isnull("city"),
+                isnull("first_name"), isnull("last_name"), isnull("job")
+            )
+        )
+        # Delete flag evaluated once per event, shared by both apply_changes
+        .withColumn("is_delete", col("operation") == "DELETE")
+        # Event time (ms) in the high bits, source sequenceNum in the low 20 bits
+        .withColumn(
+            "seq_packed",
+            expr("shiftleft(unix_millis(dt_current_timestamp), 20) | (sequenceNum & 1048575)")
+        )
+    )
 
 
 # ============================================================================
@@ -82,17 +115,28 @@ def silver_users_staging():
 dlt.create_streaming_table(
     name="silver_users_current",
     comment="Current user state - Auto CDC SCD Type 1",
-    table_properties={"quality": "silver", "scd_type": "1"}
+    spark_conf=CDC_SPARK_CONF,
+    cluster_by=["cpf"],
+    table_properties={
+        "quality": "silver",
+        "scd_type": "1",
+        "delta.enableChangeDataFeed": "true",
+        "delta.autoOptimize.optimizeWrite": "true",
+        "delta.autoOptimize.autoCompact": "true",
+        "delta.enableDeletionVectors": "true"
+    }
 )
 
 dlt.apply_changes(
     target="silver_users_current",
     source="silver_users_staging",
     keys=["cpf"],
-    sequence_by=col("sequenceNum"),
+    sequence_by=col("seq_packed"),
     stored_as_scd_type=1,
-    apply_as_deletes="operation = 'DELETE'",
-    except_column_list=["operation", "sequenceNum", "dt_current_timestamp"]
+    apply_as_deletes=col("is_delete"),
+    except_column_list=[
+        "operation", "sequenceNum", "dt_current_timestamp", "content_hash", "is_delete", "seq_packed"
+    ]
 )
 
 
@@ -103,18 +147,26 @@ dlt.apply_changes(
 dlt.create_streaming_table(
     name="silver_users_history",
     comment="Complete user history - Auto CDC SCD Type 2",
-    table_properties={"quality": "silver", "scd_type": "2"}
+    spark_conf=CDC_SPARK_CONF,
+    cluster_by=["cpf"],
+    table_properties={
+        "quality": "silver",
+        "scd_type": "2",
+        "delta.autoOptimize.optimizeWrite": "true",
+        "delta.autoOptimize.autoCompact": "true",
+        "delta.enableDeletionVectors": "true"
+    }
 )
 
 dlt.apply_changes(
     target="silver_users_history",
     source="silver_users_staging",
     keys=["cpf"],
-    sequence_by=col("sequenceNum"),
+    sequence_by=col("seq_packed"),
     stored_as_scd_type=2,
-    track_history_column_list=["email", "delivery_address", "city", "first_name", "last_name", "job"],
-    apply_as_deletes="operation = 'DELETE'",
-    except_column_list=["operation", "sequenceNum", "dt_current_timestamp"]
+    track_history_column_list=["content_hash"],
+    apply_as_deletes=col("is_delete"),
+    except_column_list=["operation", "sequenceNum", "dt_current_timestamp", "is_delete", "seq_packed"]
 )
 
 
@@ -125,13 +177,23 @@ dlt.apply_changes(
 """
 1. AUTOMATIC OPERATION HANDLING:
    - apply_changes() reads 'operation' column automatically
+   - is_delete (operation = 'DELETE') is precomputed in staging and
+     passed as apply_as_deletes
    - INSERT: Creates new record
    - UPDATE: Modifies existing record
    - DELETE: Removes (Type 1) or soft-deletes (Type 2)
 
 2. OUT-OF-ORDER EVENTS:
-   - sequence_by=col("sequenceNum") ensures correct ordering
-   - Events processed in sequenceNum order, not arrival order
+   - sequence_by=col("seq_packed") ensures correct ordering
+   - seq_packed = (epoch ms of dt_current_timestamp << 20) | (sequenceNum & 0xFFFFF)
+   - MongoDB and MSSQL sequenceNum ranges overlap, so the event time
+     orders across sources and sequenceNum breaks ties within a millisecond
+   - Events processed in seq_packed order, not arrival order
+   - Limits: seq_packed is NULL if either input is NULL, and apply_changes
+     rejects NULL sequencing values - Bronze drops such events
+     (valid_sequence expectation). Only the low 20 bits of sequenceNum are
+     kept, so same-millisecond ties are only ordered correctly while
+     sequenceNum stays below 1,048,576 (larger values wrap)
    - Prevents data inconsistency from network delays
 
 3. SCD TYPE 1 vs TYPE 2:
@@ -145,15 +207,32 @@ dlt.apply_changes(
    - UPDATE creates new version
    - Adds: __START_AT, __END_AT, __CURRENT columns
 
+   Type 1 also enables Change Data Feed, so history can be rebuilt with
+   table_changes() for audits when the Type 2 table is not needed.
+
+   Both targets are liquid-clustered on cpf, so each apply_changes
+   merge probes the few files holding a key instead of scanning the table.
+
+   Both targets enable deletion vectors: DELETEs and in-place UPDATEs
+   mark rows in a bitmap instead of rewriting whole Parquet files.
+   Run OPTIMIZE ... (or REORG TABLE ... APPLY (PURGE)) periodically to
+   physically drop the marked rows.
+
 4. STREAMING SOURCE:
-   - Uses create_streaming_table() for continuous processing
-   - Processes events as they arrive
-   - Real-time CDC capability
+   - Uses create_streaming_table() for incremental processing
+   - pipelines.trigger.interval batches events every 10 minutes
+   - One Delta commit per interval instead of per tiny micro-batch
+   - optimizeWrite/autoCompact coalesce the remaining small files
 
 5. FIELD-LEVEL TRACKING (Type 2 only):
    - track_history_column_list: Only these fields trigger new versions
    - Changes to other fields update in-place
    - Reduces storage for high-cardinality changes
+   - content_hash = xxhash64 of email, delivery_address, city, first_name,
+     last_name, job plus an isnull() flag per field, so version detection
+     is one BIGINT compare instead of six string compares
+   - The isnull() flags keep the hash position-aware: xxhash64 skips NULL
+     inputs, and each source leaves the other source's fields NULL
 
 QUERY EXAMPLES:
 
@@ -145,6 +145,51 @@ LIMIT 1;
 -- Expected result: The version of the user that was active on 2025-01-01
 
 
+-- ============================================================================
+-- ADVANCED QUERY: History from Change Data Feed (SCD Type 1)
+-- ============================================================================
+--
+-- USE CASE: Audit trail without reading the physical SCD Type 2 table
+-- WHY: CDF only records the rows each commit changed; versions are rebuilt
+--      from _commit_timestamp instead of being stored as duplicated rows
+--
+
+WITH changes AS (
+  SELECT
+    cpf,
+    email,
+    city,
+    first_name,
+    last_name,
+    _change_type,
+    _commit_version,
+    _commit_timestamp
+  FROM table_changes('main.uber_eats_analytics.silver_users_current', 0)
+  WHERE cpf = '12345678900'
+    AND _change_type IN ('insert', 'update_postimage', 'delete')
+),
+versions AS (
+  SELECT
+    *,
+    _commit_timestamp AS __START_AT,
+    LEAD(_commit_timestamp) OVER (PARTITION BY cpf ORDER BY _commit_version) AS __END_AT
+  FROM changes
+)
+SELECT
+  cpf,
+  email,
+  city,
+  first_name,
+  last_name,
+  __START_AT,
+  __END_AT
+FROM versions
+WHERE _change_type <> 'delete'
+ORDER BY __START_AT DESC;
+
+-- Expected result: Same shape as QUERY 2, limited to the CDF retention window
+
+
 -- ============================================================================
 -- QUERY PATTERNS SUMMARY
 -- ============================================================================
@@ -170,4 +215,7 @@ WHERE __END_AT IS NOT NULL
 
 Point-in-time from Type 2:
 WHERE __START_AT <= 'date' AND (__END_AT > 'date' OR __END_AT IS NULL)
+
+History from Type 1 Change Data Feed:
+table_changes('silver_users_current', 0) + LEAD(_commit_timestamp)
 */